@@ -1,8 +1,15 @@
 import os
+import re
 import sys
+import json
 import time
+import random
+import asyncio
 import tempfile
-from typing import List, Dict, Any, Optional
+import functools
+import email.utils
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Callable, Awaitable, AsyncIterator, Tuple
 import logging
 
 # Setup logging
@@ -10,10 +17,183 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 try:
-    from openai import OpenAI, AzureOpenAI
+    import httpx
+    from openai import (
+        AsyncOpenAI,
+        AsyncAzureOpenAI,
+        DefaultAsyncHttpxClient,
+        APIStatusError,
+        AuthenticationError,
+        APITimeoutError,
+        APIConnectionError,
+        RateLimitError,
+    )
+except ImportError as exc:
+    # raise rather than exit so importing this module never kills the host process
+    raise ImportError("Required packages not installed. Install with: pip install openai") from exc
+
+# HTTP/2 lets concurrent requests share one connection per host; httpx only
+# supports it when the optional h2 package is installed
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
 except ImportError:
-    logger.error("Required packages not installed. Install with: pip install openai")
-    sys.exit(1)
+    HTTP2_AVAILABLE = False
+
+# Chunk / buffer size used when streaming file bodies to and from disk; the
+# 8 KiB io default means far more syscalls for multi-MB files
+CHUNK_SIZE = 1 << 20
+
+# Filename in a Content-Disposition header, e.g. attachment; filename="notes.pdf"
+CONTENT_DISPOSITION_FILENAME = re.compile(r'filename="?([^";]+)"?')
+
+# Connection pool shared by both clients; keep-alive avoids a TLS handshake
+# per call
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60)
+
+# Capacity of each queue between pipeline stages; bounds how many assistants
+# are held in memory at once
+PIPELINE_QUEUE_SIZE = 16
+
+# Model families used to pick a fallback deployment, most specific first so
+# that "gpt-4o" is not mistaken for "gpt-4"
+GPT4_FAMILIES = ("gpt-4o", "gpt-4-turbo", "gpt-4")
+MODEL_FAMILIES = GPT4_FAMILIES + ("gpt-35-turbo",)
+
+# GPT-4 Turbo snapshots whose names don't say "turbo"
+GPT4_TURBO_SNAPSHOTS = ("gpt-4-1106", "gpt-4-0125", "gpt-4-vision")
+
+# 4xx responses that are worth retrying; every other 4xx is a caller error
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429}
+
+def _is_retryable(exc: Exception) -> bool:
+    """Return True for transient failures (timeouts, throttling, 5xx)."""
+    if isinstance(exc, (RateLimitError, APITimeoutError, APIConnectionError)):
+        return True
+    # errors while reading a streamed body come straight from httpx, unwrapped
+    if isinstance(exc, (httpx.TransportError, httpx.TimeoutException)):
+        return True
+    if isinstance(exc, APIStatusError):
+        return exc.status_code in RETRYABLE_STATUS_CODES or exc.status_code >= 500
+    return False
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    """Return the delay in seconds requested by a ``retry-after-ms`` / ``retry-after`` header."""
+    if not isinstance(exc, APIStatusError):
+        return None
+    headers = exc.response.headers
+    if "retry-after-ms" in headers:
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass  # fall through to retry-after
+    if "retry-after" in headers:
+        retry_after = headers["retry-after"]
+        try:
+            return float(retry_after)
+        except ValueError:
+            # retry-after may also be an HTTP date
+            retry_date = email.utils.parsedate_tz(retry_after)
+            if retry_date is not None:
+                return email.utils.mktime_tz(retry_date) - time.time()
+    return None
+
+def _with_retry(
+    fn: Optional[Callable[..., Awaitable[Any]]] = None,
+    *,
+    max_attempts: int = 3,
+    base: float = 1.0,
+    cap: float = 60.0,
+    describe: Optional[Callable[..., str]] = None
+):
+    """Retry an async callable on transient errors with exponential backoff + jitter.
+
+    A delay requested by the server via ``retry-after-ms`` / ``retry-after``
+    takes precedence over the backoff; both are capped at ``cap`` seconds.
+
+    Retry warnings name the wrapped function, or whatever ``describe`` returns
+    when called with the same arguments.
+
+    Usable bare (``@_with_retry``) or with arguments (``@_with_retry(max_attempts=5)``).
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            for attempt in range(max_attempts):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as exc:
+                    if attempt == max_attempts - 1 or not _is_retryable(exc):
+                        raise
+                    retry_after = _retry_after(exc)
+                    if retry_after is not None and retry_after > 0:
+                        delay = min(cap, retry_after)
+                    else:
+                        delay = min(cap, base * 2 ** attempt) + random.uniform(0, base)
+                    label = describe(*args, **kwargs) if describe else func.__name__
+                    logger.warning(
+                        f"{label} failed ({exc}); retrying in {delay:.1f}s "
+                        f"[{attempt + 1}/{max_attempts}]"
+                    )
+                    await asyncio.sleep(delay)
+        return wrapper
+
+    if fn is not None:
+        return decorator(fn)
+    return decorator
+
+def _describe_call(self: Any, limiter: Any, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> str:
+    """Name the SDK method behind an ``AssistantMigrator._call`` for retry logs."""
+    return getattr(fn, "__qualname__", repr(fn))
+
+def _model_family(model: str) -> Optional[str]:
+    """Map a model or deployment name to its family, e.g. ``gpt-4o-2024-05-13`` → ``gpt-4o``."""
+    normalized = model.lower().replace("gpt-3.5", "gpt-35")
+    if any(snapshot in normalized for snapshot in GPT4_TURBO_SNAPSHOTS):
+        return "gpt-4-turbo"
+    return next((family for family in MODEL_FAMILIES if family in normalized), None)
+
+async def _cancel_and_wait(tasks: List["asyncio.Future[Any]"]) -> None:
+    """Cancel ``tasks`` and wait until all of them have actually finished."""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+def _remove_file(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+class TokenBucket:
+    """Async token-bucket rate limiter.
+
+    Holds up to ``capacity`` tokens and refills at ``refill_rate`` tokens per
+    second; ``acquire()`` waits until a token is available.
+    """
+
+    def __init__(self, capacity: float, refill_rate: float):
+        if refill_rate <= 0:
+            raise ValueError(f"Requests per second must be positive, got {refill_rate}")
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.refill_rate)
+        self._last_refill = now
+
+    async def acquire(self) -> None:
+        # the lock keeps waiters in FIFO order
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.refill_rate)
+                self._refill()
+            self._tokens -= 1
 
 class AssistantMigrator:
     def __init__(
@@ -21,96 +201,246 @@ class AssistantMigrator:
         openai_api_key: str,
         azure_api_key: str,
         azure_endpoint: str,
-        azure_api_version: str = "2023-12-01-preview"
+        azure_api_version: str = "2023-12-01-preview",
+        max_concurrency: int = 8,
+        openai_requests_per_second: float = 5.0,
+        azure_requests_per_second: float = 5.0,
+        state_path: Optional[str] = None
     ):
-        self.openai_client = OpenAI(api_key=openai_api_key)
+        # One HTTP client (and connection pool) on one event loop serves both
+        # SDKs. SDK-level retries are disabled; _with_retry owns the retry policy
+        if not HTTP2_AVAILABLE:
+            logger.info("h2 not installed, using HTTP/1.1. Install with: pip install 'httpx[http2]'")
+        self._http_client = DefaultAsyncHttpxClient(http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS)
         
-        self.azure_client = AzureOpenAI(
+        self.openai_client = AsyncOpenAI(
+            api_key=openai_api_key,
+            max_retries=0,
+            http_client=self._http_client
+        )
+        
+        self.azure_client = AsyncAzureOpenAI(
             api_key=azure_api_key,
             api_version=azure_api_version,
-            azure_endpoint=azure_endpoint
+            azure_endpoint=azure_endpoint,
+            max_retries=0,
+            http_client=self._http_client
         )
         
-        # Validation
-        try:
-            self.openai_client.models.list()
-            logger.info("Successfully connected to OpenAI API")
-        except Exception as e:
-            logger.error(f"Failed to connect to OpenAI API: {e}")
-            sys.exit(1)
-            
-        try:
-            self.azure_client.models.list()
-            logger.info("Successfully connected to Azure OpenAI API")
-        except Exception as e:
-            logger.error(f"Failed to connect to Azure OpenAI API: {e}")
-            sys.exit(1)
+        # Number of assistants migrated concurrently
+        self.max_concurrency = max_concurrency
+        
+        # Separate limiters, each service has its own quota
+        self._openai_limiter = TokenBucket(
+            capacity=max(1.0, openai_requests_per_second),
+            refill_rate=openai_requests_per_second
+        )
+        self._azure_limiter = TokenBucket(
+            capacity=max(1.0, azure_requests_per_second),
+            refill_rate=azure_requests_per_second
+        )
+        
+        # Checkpoint of completed migrations, tied to the target endpoint;
+        # None disables resuming
+        self.state_path = state_path
+        self.azure_endpoint = azure_endpoint.rstrip("/")
+        
+        # Assistants created on Azure without some of their files in this run
+        self.partial_migrations: Dict[str, Dict[str, Any]] = {}
+        
+        # Azure deployment ids, fetched on first use and reused for every assistant
+        self._azure_deployments: Optional[List[str]] = None
+        self._azure_deployment_set: frozenset = frozenset()
+        self._deployment_index: Dict[str, str] = {}
+        self._default_deployment: Optional[str] = None
+        self._deployments_lock = asyncio.Lock()
+        
+        # Files shared between assistants are downloaded and uploaded only once;
+        # _local_files holds downloads that have not been uploaded yet
+        self._local_files: Dict[str, Dict[str, str]] = {}
+        self._file_id_map: Dict[str, str] = {}
+        self._file_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+    
+    async def __aenter__(self) -> "AssistantMigrator":
+        return self
+    
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+    
+    async def close(self) -> None:
+        """Close the pooled HTTP connections and remove leftover temp files."""
+        await self._http_client.aclose()
+        for local_file in self._local_files.values():
+            _remove_file(local_file["path"])
+        self._local_files.clear()
+    
+    def _cache_deployments(self, deployment_ids: List[str]) -> None:
+        self._azure_deployments = deployment_ids
+        self._azure_deployment_set = frozenset(deployment_ids)
+        
+        # first deployment of each model family, built in a single pass
+        self._deployment_index = {}
+        for deployment_id in deployment_ids:
+            family = _model_family(deployment_id)
+            if family:
+                self._deployment_index.setdefault(family, deployment_id)
+        
+        # last resort: any GPT-4 deployment, else whatever is deployed first
+        self._default_deployment = next(
+            (self._deployment_index[f] for f in GPT4_FAMILIES if f in self._deployment_index),
+            deployment_ids[0] if deployment_ids else None
+        )
+    
+    async def _get_azure_deployments(self) -> List[str]:
+        """Return the Azure deployment ids, listing them on first use only."""
+        async with self._deployments_lock:
+            if self._azure_deployments is None:
+                models = await self._call(self._azure_limiter, self.azure_client.models.list)
+                self._cache_deployments([m.id for m in models.data])
+        return self._azure_deployments
     
-    def _download_file(self, file_id: str) -> str:
-        """Download a file from OpenAI and return a temporary path."""
+    @_with_retry(describe=_describe_call)
+    async def _call(self, limiter: TokenBucket, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """Issue a single SDK request under ``limiter``, retrying transient failures."""
+        await limiter.acquire()
+        return await fn(*args, **kwargs)
+    
+    async def _download_file(self, file_id: str) -> Dict[str, str]:
+        """Download a file from OpenAI to a private temp file and return its details."""
         logger.info(f"Downloading file {file_id} from OpenAI …")
-
         try:
-            # Recommended pattern in openai-python ≥1.14
-            with self.openai_client.files.content(file_id) as remote_fp:
-                file_bytes = remote_fp.read()
+            return await self._stream_file_to_disk(file_id)
         except Exception as exc:
+            # logged once, after the last attempt
             logger.error(f"Unable to download file {file_id}: {exc}")
             raise
+    
+    @_with_retry(describe=lambda self, file_id: f"Download of {file_id}")
+    async def _stream_file_to_disk(self, file_id: str) -> Dict[str, str]:
 
-        meta = self.openai_client.files.retrieve(file_id)
-        filename = meta.filename or f"{file_id}.bin"
-        file_path = os.path.join(tempfile.gettempdir(), filename)
+        # unique 0600 file; the original name is kept separately for the upload
+        fd, file_path = tempfile.mkstemp(prefix=f"{file_id}_")
+        try:
+            with os.fdopen(fd, "wb", buffering=CHUNK_SIZE) as local_fp:
+                # stream the body to disk chunk by chunk instead of buffering it in memory
+                await self._openai_limiter.acquire()
+                async with self.openai_client.files.with_streaming_response.content(file_id) as response:
+                    # take the filename from the response headers to save a files.retrieve
+                    # round trip; the extension matters to Azure, so only fall back to
+                    # the metadata lookup when the header is missing
+                    match = CONTENT_DISPOSITION_FILENAME.search(response.headers.get("content-disposition", ""))
+                    if match:
+                        filename = os.path.basename(match.group(1))
+                    else:
+                        await self._openai_limiter.acquire()
+                        filename = (await self.openai_client.files.retrieve(file_id)).filename
 
-        with open(file_path, "wb") as local_fp:
-            local_fp.write(file_bytes)
+                    async for chunk in response.iter_bytes(CHUNK_SIZE):
+                        local_fp.write(chunk)
+        except Exception:
+            _remove_file(file_path)
+            raise
 
         logger.info(f"Saved to {file_path}")
-        return file_path
+        return {"id": file_id, "path": file_path, "filename": filename or f"{file_id}.bin"}
+    
+    async def _get_local_file(self, file_id: str) -> Dict[str, str]:
+        """Return a local copy of an OpenAI file, downloading it on first use only.
+
+        Files already uploaded to Azure are not downloaded again; their details
+        only carry the ``id``.
+        """
+        async with self._file_locks[file_id]:
+            if file_id in self._file_id_map:
+                return {"id": file_id}
+            if file_id not in self._local_files:
+                self._local_files[file_id] = await self._download_file(file_id)
+            return self._local_files[file_id]
     
-    def _upload_file_to_azure(self, file_path: str) -> str:
+    async def _get_azure_file(self, file_id: str) -> str:
+        """Return the Azure file ID for an OpenAI file, uploading it on first use only."""
+        async with self._file_locks[file_id]:
+            if file_id not in self._file_id_map:
+                # download again if an earlier failed upload already discarded the copy
+                local_file = self._local_files.pop(file_id, None) or await self._download_file(file_id)
+                try:
+                    self._file_id_map[file_id] = await self._upload_file_to_azure(
+                        local_file["path"], local_file["filename"]
+                    )
+                finally:
+                    # free the temp file as soon as the upload is done
+                    _remove_file(local_file["path"])
+            return self._file_id_map[file_id]
+    
+    async def _upload_file_to_azure(self, file_path: str, filename: Optional[str] = None) -> str:
         """Upload a file to Azure OpenAI and return the file ID"""
         logger.info(f"Uploading file {file_path} to Azure OpenAI...")
         
         try:
-            with open(file_path, "rb") as f:
-                response = self.azure_client.files.create(
-                    file=f,
-                    purpose="assistants"
-                )
-            logger.info(f"File uploaded to Azure OpenAI with ID: {response.id}")
-            return response.id
+            file_id = await self._post_file_to_azure(file_path, filename)
         except Exception as e:
+            # logged once, after the last attempt
             logger.error(f"Failed to upload file to Azure OpenAI: {e}")
-            return None
+            raise
+        logger.info(f"File uploaded to Azure OpenAI with ID: {file_id}")
+        return file_id
     
-    def get_openai_assistants(self) -> List[Any]:
+    @_with_retry(describe=lambda self, file_path, filename: f"Upload of {file_path}")
+    async def _post_file_to_azure(self, file_path: str, filename: Optional[str]) -> str:
+        await self._azure_limiter.acquire()
+        # pass the open handle (not the path or its bytes): the SDK hands file
+        # objects to httpx untouched and the multipart body is streamed from disk
+        with open(file_path, "rb", buffering=CHUNK_SIZE) as f:
+            response = await self.azure_client.files.create(
+                file=(filename or os.path.basename(file_path), f),
+                purpose="assistants"
+            )
+        return response.id
+    
+    async def get_openai_assistants(self) -> AsyncIterator[Any]:
         """Stream all assistants from OpenAI (no 100-item cap)."""
         logger.info("Fetching assistants from OpenAI …")
 
         try:
-            # auto_paging_iter() yields every item across pages
-            return list(
-                self.openai_client.beta.assistants.list(limit=100).auto_paging_iter()
+            # one cursor for the whole run; 100 is the API's maximum page size,
+            # so this is already the fewest possible round trips
+            page = await self._call(
+                self._openai_limiter, self.openai_client.beta.assistants.list, limit=100
             )
+            while True:
+                # request the next page while this one is being consumed, so the
+                # page boundary doesn't cost a full round trip
+                next_page = None
+                if page.has_next_page():
+                    next_page = asyncio.ensure_future(
+                        self._call(self._openai_limiter, page.get_next_page)
+                    )
+                try:
+                    for assistant in page.data:
+                        yield assistant
+                    if next_page is None:
+                        return
+                    page = await next_page
+                finally:
+                    if next_page is not None and not next_page.done():
+                        # don't let the prefetch outlive the generator (and the HTTP client)
+                        await _cancel_and_wait([next_page])
         except Exception as exc:
             logger.error(f"Assistant fetch failed: {exc}")
-            return []
+            raise
     
-    def get_assistant_details(self, assistant_id: str) -> Dict[str, Any]:
+    async def get_assistant_details(self, assistant_id: str) -> Dict[str, Any]:
         """Get detailed information about an assistant"""
         logger.info(f"Fetching details for assistant {assistant_id}...")
         try:
-            assistant = self.openai_client.beta.assistants.retrieve(assistant_id)
+            assistant = await self._call(
+                self._openai_limiter, self.openai_client.beta.assistants.retrieve, assistant_id
+            )
             
-            # Get file details
-            file_details = []
-            for file_id in assistant.file_ids:
-                file_path = self._download_file(file_id)
-                file_details.append({
-                    "id": file_id,
-                    "path": file_path
-                })
+            # Download files concurrently; the rate limiter paces the requests
+            file_details = list(await asyncio.gather(
+                *(self._get_local_file(file_id) for file_id in assistant.file_ids)
+            ))
             
             return {
                 "id": assistant.id,
@@ -120,31 +450,46 @@ class AssistantMigrator:
                 "tools": assistant.tools,
                 "file_details": file_details
             }
+        except AuthenticationError:
+            raise  # bad credentials: abort the run instead of failing every assistant
         except Exception as e:
             logger.error(f"Failed to fetch details for assistant {assistant_id}: {e}")
             return {}
     
-    def create_azure_assistant(self, details: Dict[str, Any]) -> Optional[str]:
+    async def upload_assistant_files(self, details: Dict[str, Any]) -> List[str]:
+        """Upload an assistant's files to Azure OpenAI and return their Azure IDs"""
+        # Upload files concurrently; failed uploads are already logged and the
+        # assistant is migrated without them
+        uploads = await asyncio.gather(
+            *(self._get_azure_file(file_detail["id"])
+              for file_detail in details.get("file_details", [])),
+            return_exceptions=True
+        )
+        for result in uploads:
+            if isinstance(result, AuthenticationError):
+                raise result
+        return [file_id for file_id in uploads if not isinstance(file_id, BaseException)]
+    
+    async def create_azure_assistant(self, details: Dict[str, Any]) -> Optional[str]:
         """Create an assistant on Azure OpenAI based on the provided details"""
         logger.info(f"Creating assistant '{details.get('name')}' on Azure OpenAI...")
         
-        # Handle files
-        azure_file_ids = []
-        for file_detail in details.get("file_details", []):
-            azure_file_id = self._upload_file_to_azure(file_detail["path"])
-            if azure_file_id:
-                azure_file_ids.append(azure_file_id)
+        # Files may already have been uploaded by the pipeline's upload stage
+        azure_file_ids = details.get("azure_file_ids")
+        if azure_file_ids is None:
+            azure_file_ids = await self.upload_assistant_files(details)
         
         # Find an appropriate model / deployment available in Azure
         try:
-            deployments = self.azure_client.models.list().data
-            deployment_ids = [d.id for d in deployments]
+            await self._get_azure_deployments()
 
             target_model = details.get("model")
-            if target_model not in deployment_ids:
-                # fall-back logic
-                gpt4 = next((d for d in deployment_ids if "gpt-4" in d), None)
-                target_model = gpt4 or (deployment_ids[0] if deployment_ids else None)
+            if target_model not in self._azure_deployment_set:
+                # fall-back: same model family, then the default deployment
+                target_model = (
+                    self._deployment_index.get(_model_family(target_model or ""))
+                    or self._default_deployment
+                )
 
             if not target_model:
                 logger.error("No deployments available in Azure OpenAI.")
@@ -152,7 +497,9 @@ class AssistantMigrator:
             if target_model != details.get("model"):
                 logger.info(f"Using Azure deployment '{target_model}' instead of '{details.get('model')}'")
 
-            response = self.azure_client.beta.assistants.create(
+            response = await self._call(
+                self._azure_limiter,
+                self.azure_client.beta.assistants.create,
                 name=details.get("name"),
                 instructions=details.get("instructions"),
                 model=target_model,               # deployment id
@@ -161,34 +508,190 @@ class AssistantMigrator:
             )
             logger.info(f"Created Azure assistant {response.id}")
             return response.id
+        except AuthenticationError:
+            raise
         except Exception as exc:
             logger.error(f"Azure assistant creation failed: {exc}")
             return None
     
-    def migrate_all_assistants(self) -> Dict[str, str]:
-        """Migrate all assistants from OpenAI to Azure OpenAI."""
+    def _load_state(self) -> Dict[str, Any]:
+        """Load the checkpoint persisted by a previous run, if any.
+
+        ``migrated`` maps OpenAI to Azure assistant IDs; ``partial`` holds
+        assistants created without some of their files. A checkpoint written
+        for a different Azure endpoint is refused.
+        """
+        state: Dict[str, Any] = {"azure_endpoint": self.azure_endpoint, "migrated": {}, "partial": {}}
+        if not self.state_path or not os.path.exists(self.state_path):
+            return state
+        with open(self.state_path) as fp:
+            saved = json.load(fp)
+        if saved.get("azure_endpoint") != self.azure_endpoint:
+            raise ValueError(
+                f"{self.state_path} is a checkpoint for {saved.get('azure_endpoint')}, "
+                f"not {self.azure_endpoint}; use a different state file"
+            )
+        state.update(saved)
+        logger.info(
+            f"Resuming from {self.state_path}: {len(state['migrated'])} assistants already migrated, "
+            f"{len(state['partial'])} partially"
+        )
+        return state
+    
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        """Persist the checkpoint atomically (write to a temp file, then rename)."""
+        if not self.state_path:
+            return
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(state, fp, indent=2)
+        os.replace(tmp_path, self.state_path)
+    
+    async def _run_stage(
+        self,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+        handler: Callable[[Any], Awaitable[Any]]
+    ) -> None:
+        """Run ``max_concurrency`` workers passing items from ``inbox`` through ``handler``.
+
+        Truthy results are put on ``outbox``. ``None`` on ``inbox`` ends the
+        stage, after which ``None`` is forwarded to ``outbox``.
+        """
+        async def worker() -> None:
+            while True:
+                item = await inbox.get()
+                if item is None:
+                    await inbox.put(None)  # let the sibling workers see it too
+                    return
+                result = await handler(item)
+                if result and outbox is not None:
+                    await outbox.put(result)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.max_concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            # gather() leaves the remaining workers running when one fails
+            await _cancel_and_wait(workers)
+            raise
+        if outbox is not None:
+            await outbox.put(None)
+
+    async def migrate_all_assistants(self) -> Dict[str, str]:
+        """Migrate all assistants from OpenAI to Azure OpenAI.
+
+        Runs as a three-stage pipeline (fetch details + download files, upload
+        files, create assistant) so different assistants overlap across stages.
+        Returns only the assistants migrated by this call; those finished by an
+        earlier run are read from the checkpoint and skipped.
+        """
+        state = self._load_state()
         migration_map: Dict[str, str] = {}
+        self.partial_migrations = {}
+        assistant_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        upload_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        create_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
 
-        # iterate directly over the paginated cursor to reduce RAM usage
-        cursor = self.openai_client.beta.assistants.list(limit=100).auto_paging_iter()
-        for assistant in cursor:
+        async def fetch_details(assistant: Any) -> Dict[str, Any]:
             logger.info(f"Migrating assistant: {getattr(assistant, 'name', assistant.id)}")
+            return await self.get_assistant_details(assistant.id)
+
+        async def upload_files(details: Dict[str, Any]) -> Dict[str, Any]:
+            details["azure_file_ids"] = await self.upload_assistant_files(details)
+            return details
+
+        async def create_assistant(details: Dict[str, Any]) -> None:
+            azure_assistant_id = await self.create_azure_assistant(details)
+            if not azure_assistant_id:
+                logger.error(f"Failed to migrate assistant {details['id']}")
+                return
 
-            details = self.get_assistant_details(assistant.id)
-            if not details:
-                continue
+            # files whose upload failed were left out of the Azure assistant;
+            # record it as partial so it is reported and not silently skipped
+            missing_file_ids = [
+                file_detail["id"] for file_detail in details.get("file_details", [])
+                if file_detail["id"] not in self._file_id_map
+            ]
+            if missing_file_ids:
+                partial = {"azure_assistant_id": azure_assistant_id, "missing_file_ids": missing_file_ids}
+                state["partial"][details["id"]] = self.partial_migrations[details["id"]] = partial
+                logger.warning(
+                    f"Migrated {details['id']} → {azure_assistant_id} without files: {', '.join(missing_file_ids)}"
+                )
+            else:
+                state["migrated"][details["id"]] = migration_map[details["id"]] = azure_assistant_id
+                logger.info(f"Successfully migrated {details['id']} → {azure_assistant_id}")
+            self._save_state(state)
 
-            azure_assistant_id = self.create_azure_assistant(details)
-            if azure_assistant_id:
-                migration_map[assistant.id] = azure_assistant_id
-                logger.info(f"Successfully migrated {assistant.id} → {azure_assistant_id}")
+        async def produce() -> None:
+            # iterate directly over the paginated cursor to reduce RAM usage
+            assistants = self.get_openai_assistants()
+            try:
+                async for assistant in assistants:
+                    if assistant.id in state["migrated"]:
+                        logger.info(f"Skipping {assistant.id}: already migrated to {state['migrated'][assistant.id]}")
+                        continue
+                    if assistant.id in state["partial"]:
+                        # re-creating it would duplicate the Azure assistant
+                        partial = state["partial"][assistant.id]
+                        logger.warning(
+                            f"Skipping {assistant.id}: already migrated to {partial['azure_assistant_id']} "
+                            f"without files: {', '.join(partial['missing_file_ids'])}"
+                        )
+                        continue
+                    await assistant_queue.put(assistant)
+            except asyncio.CancelledError:
+                # the pipeline is being torn down and nobody drains the queue any
+                # more, so putting the end marker on a full queue would block forever
+                raise
+            except BaseException:
+                # let in-flight assistants drain even if listing failed
+                await assistant_queue.put(None)
+                raise
             else:
-                logger.error(f"Failed to migrate assistant {assistant.id}")
+                await assistant_queue.put(None)
+            finally:
+                await assistants.aclose()
+
+        producer = asyncio.ensure_future(produce())
+        stages = [
+            asyncio.ensure_future(self._run_stage(assistant_queue, upload_queue, fetch_details)),
+            asyncio.ensure_future(self._run_stage(upload_queue, create_queue, upload_files)),
+            asyncio.ensure_future(self._run_stage(create_queue, None, create_assistant)),
+        ]
 
-            time.sleep(1)  # minimal throttle; tune if you hit rate limits
+        try:
+            # a failed stage would leave the stages before it blocked on a full
+            # queue, so cancel everything as soon as one of them raises
+            try:
+                await asyncio.gather(*stages)
+            except BaseException:
+                await _cancel_and_wait([producer, *stages])
+                raise
+            await producer
+        except AuthenticationError as exc:
+            # connectivity is validated lazily: the first rejected request ends the run
+            raise ConnectionError(
+                f"Authentication with {exc.request.url.host} failed, check the API key: {exc}"
+            ) from exc
 
         return migration_map
 
+async def _run(
+    openai_api_key: str, azure_api_key: str, azure_endpoint: str
+) -> Tuple[Dict[str, str], Dict[str, Dict[str, Any]]]:
+    async with AssistantMigrator(
+        openai_api_key=openai_api_key,
+        azure_api_key=azure_api_key,
+        azure_endpoint=azure_endpoint,
+        openai_requests_per_second=float(os.environ.get("OPENAI_REQUESTS_PER_SECOND", 5.0)),
+        azure_requests_per_second=float(os.environ.get("AZURE_OPENAI_REQUESTS_PER_SECOND", 5.0)),
+        state_path=os.environ.get("MIGRATION_STATE_PATH", "migration_state.json")
+    ) as migrator:
+        migration_results = await migrator.migrate_all_assistants()
+        return migration_results, migrator.partial_migrations
+
 def main():
     # Check for environment variables
     openai_api_key = os.environ.get("OPENAI_API_KEY")
@@ -204,13 +707,13 @@ def main():
         )
         sys.exit(1)
     
-    migrator = AssistantMigrator(
-        openai_api_key=openai_api_key,
-        azure_api_key=azure_api_key,
-        azure_endpoint=azure_endpoint
-    )
-    
-    migration_results = migrator.migrate_all_assistants()
+    try:
+        migration_results, partial_results = asyncio.run(
+            _run(openai_api_key, azure_api_key, azure_endpoint)
+        )
+    except (ConnectionError, ValueError) as e:
+        logger.error(f"Migration aborted: {e}")
+        sys.exit(1)
     
     logger.info("Migration completed!")
     logger.info("Migration summary:")
@@ -218,6 +721,14 @@ def main():
         logger.info(f"- {source_id} → {target_id}")
     
     logger.info(f"Successfully migrated {len(migration_results)} assistants")
+    
+    if partial_results:
+        logger.warning(f"{len(partial_results)} assistants were migrated with missing files:")
+        for source_id, partial in partial_results.items():
+            logger.warning(
+                f"- {source_id} → {partial['azure_assistant_id']} "
+                f"(missing: {', '.join(partial['missing_file_ids'])})"
+            )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file